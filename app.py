@@ -1,11 +1,26 @@
 import os
-import re
+import numpy as np
 import pandas as pd
 import unicodedata
 from datetime import datetime
+from functools import lru_cache
 import streamlit as st
 from io import BytesIO
 
+class _LetterSpaceTable(dict):
+    """
+    Translation table for str.translate that keeps lowercase ASCII letters and
+    whitespace and drops every other character. Entries are filled in lazily.
+    """
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        value = codepoint if ('a' <= char <= 'z' or char.isspace()) else None
+        self[codepoint] = value
+        return value
+
+# Translation table used by normalize_player_name
+_LETTERS_AND_SPACES = _LetterSpaceTable()
+
 # ----------------------- Utility Functions -----------------------
 
 def normalize_player_name(player_name):
@@ -16,24 +31,40 @@ def normalize_player_name(player_name):
     # Convert to lowercase
     name = player_name.lower()
     
-    # Unicode normalization
-    name = unicodedata.normalize('NFKD', name)
+    # Unicode normalization (pure ASCII names are already normalized)
+    if not name.isascii():
+        name = unicodedata.normalize('NFKD', name)
     
     # Keep only letters and spaces
-    name = re.sub(r'[^a-z\s]', '', name)
+    name = name.translate(_LETTERS_AND_SPACES)
     
     # Replace multiple spaces with a single space and strip
-    name = re.sub(r'\s+', ' ', name).strip()
+    name = ' '.join(name.split())
     
     return name
 
-def read_data(scores_path, injury_path):
+# Column types declared up front so read_excel skips dtype inference
+SCORES_DTYPES = {'Player_Name': 'string', 'Player': 'string', 'Regular': 'float64', 'Projection': 'float64'}
+INJURY_DTYPES = {'Player': 'string'}
+
+@st.cache_data(show_spinner=False)
+def _load_excel(path, mtime, dtype=None):
+    """
+    Parses a single Excel file. The modification time is only used as a cache
+    key so each file is re-parsed only when it changes on disk.
+    """
+    return pd.read_excel(path, engine='openpyxl', dtype=dtype)
+
+@st.cache_data(show_spinner=False)
+def read_data(scores_path, injury_path, scores_mtime, injury_mtime):
     """
     Reads and merges the scores and injury data from Excel files.
+    The modification times are only used as cache keys so the files are
+    re-parsed when they change on disk.
     """
     try:
-        df_scores = pd.read_excel(scores_path)
-        df_injuries = pd.read_excel(injury_path)
+        df_scores = _load_excel(scores_path, scores_mtime, SCORES_DTYPES)
+        df_injuries = _load_excel(injury_path, injury_mtime, INJURY_DTYPES)
 
         # Check column names and merge accordingly
         if 'Player_Name' in df_scores.columns:
@@ -45,10 +76,21 @@ def read_data(scores_path, injury_path):
         merged_df['Injury'] = merged_df['Injury'].fillna('Healthy')
         merged_df['Status'] = merged_df['Status'].fillna('Active')
 
+        # Encode injuries as categories and flag injured players once, comparing
+        # only the distinct injury labels so the display needs a boolean slice
+        merged_df['Injury'] = merged_df['Injury'].astype('category')
+        healthy_categories = np.asarray(
+            merged_df['Injury'].cat.categories.str.fullmatch('healthy', case=False, na=False), dtype=bool
+        )
+        merged_df['_is_injured'] = ~healthy_categories[merged_df['Injury'].cat.codes.to_numpy()]
+
         # Drop unnecessary columns
         if 'Player' in merged_df.columns:
             merged_df.drop(columns=['Player'], inplace=True)
 
+        # Store each distinct player name once
+        merged_df['Player_Name'] = merged_df['Player_Name'].astype('category')
+
         # We no longer enforce minimums here
 
         return merged_df
@@ -56,7 +98,8 @@ def read_data(scores_path, injury_path):
         st.error(f"Failed to read data: {e}")
         return pd.DataFrame()
 
-def get_last_updated(scores_path, injury_path):
+@st.cache_data(show_spinner=False)
+def get_last_updated(scores_path, injury_path, scores_mtime, injury_mtime):
     """
     Determines the latest modification time between the scores and injury files.
     """
@@ -77,113 +120,127 @@ def get_last_updated(scores_path, injury_path):
     except Exception as e:
         return f"Error retrieving timestamp ({e})"
 
-def calculate_week():
+@lru_cache(maxsize=1)
+def calculate_week(today_ordinal):
     """
     Calculates the current week based on a base date.
+    Takes today's date as an ordinal so the result is cached for the day.
     """
-    base_date = datetime(2024, 10, 21)
-    current_date = datetime.now()
-    delta = current_date - base_date
-    week = max(0, (delta.days // 7) + 1)
+    base_ordinal = datetime(2024, 10, 21).toordinal()
+    delta_days = today_ordinal - base_ordinal
+    week = max(0, (delta_days // 7) + 1)
     return week
 
-def calculate_score(player_name, week, data):
+def build_score_lookup(data):
     """
-    Calculates the score for a player based on the current week.
-    Enforces minimum values of 2 for 'Regular' and 'Projection'.
+    Builds a mapping of player name to (Regular, Projection) values.
+    The first row is kept for any duplicated player name.
     """
-    player_data = data[data['Player_Name'] == player_name].iloc[0]
-    regular = max(2, player_data['Regular'])
-    projection = max(2, player_data['Projection'])
-    score = (((20 - week) * projection) / 20) + ((week * regular) / 20)
-    score = max(2, score)  # Ensure the total score is at least 2
-    return score
+    unique_data = data.drop_duplicates(subset='Player_Name', keep='first')
+    return dict(zip(
+        unique_data['Player_Name'].to_numpy(),
+        zip(unique_data['Regular'].to_numpy(), unique_data['Projection'].to_numpy())
+    ))
+
+def _score_team(player_names, week, lookup):
+    """
+    Calculates the scores for a team's players based on the current week.
+    Enforces minimum values of 2 for 'Regular', 'Projection' and each score.
+    Returns the per-player scores, the formatted detail lines and the team total.
+    """
+    count = len(player_names)
+    regulars = np.fromiter((lookup[name][0] for name in player_names), dtype=np.float64, count=count)
+    projections = np.fromiter((lookup[name][1] for name in player_names), dtype=np.float64, count=count)
+    np.maximum(regulars, 2, out=regulars)
+    np.maximum(projections, 2, out=projections)
+    scores = np.maximum(2, ((20 - week) * projections + week * regulars) / 20)
+
+    details = [
+        f"**- {name}**<br>"
+        f"(Regular: {regular:g}, Projection: {projection:g}, Score: {score:.2f})"
+        for name, regular, projection, score in zip(player_names, regulars, projections, scores)
+    ]
+    return scores, details, float(scores.sum())
 
 # ----------------------- Trade Evaluation Function -----------------------
 
-def evaluate_trade(data, team1_players, team2_players):
+@st.cache_data(show_spinner=False, max_entries=256)
+def compute_trade(_lookup, data_key, team1_players, team2_players, week):
     """
-    Evaluates the trade between Team 1 and Team 2 based on selected players.
+    Computes the scores, details and trade ratio for a trade without rendering anything.
+    Takes the player lists as tuples so identical trades are served from the cache.
+    The lookup is not hashed; data_key (the data files' mtimes) invalidates the cache instead.
     """
-    week = calculate_week()
-    st.markdown(f"<h3 style='text-align: center;'>Current Week: {week}</h3>", unsafe_allow_html=True)
-
     # Team 1 Evaluation
-    team1_scores = []
-    team1_details = []
-
-    for player in team1_players:
-        score = calculate_score(player, week, data)
-        player_data = data[data['Player_Name'] == player].iloc[0]
-        regular = max(2, player_data['Regular'])
-        projection = max(2, player_data['Projection'])
-        team1_scores.append(score)
-
-        formatted_detail = (
-            f"**- {player}**<br>"
-            f"(Regular: {regular}, Projection: {projection}, Score: {score:.2f})"
-        )
-        team1_details.append(formatted_detail)
-
-    team1_total = sum(team1_scores)
+    _, team1_details, team1_total = _score_team(team1_players, week, _lookup)
 
     # Team 2 Evaluation
-    team2_scores = []
-    team2_details = []
-
-    for player in team2_players:
-        score = calculate_score(player, week, data)
-        player_data = data[data['Player_Name'] == player].iloc[0]
-        regular = max(2, player_data['Regular'])
-        projection = max(2, player_data['Projection'])
-        team2_scores.append(score)
-
-        formatted_detail = (
-            f"**- {player}**<br>"
-            f"(Regular: {regular}, Projection: {projection}, Score: {score:.2f})"
-        )
-        team2_details.append(formatted_detail)
-
-    team2_total = sum(team2_scores)
+    _, team2_details, team2_total = _score_team(team2_players, week, _lookup)
 
     # Handle empty slots for fair evaluation
     empty_slots_info = ""
     if len(team1_players) < len(team2_players):
         empty_slots = len(team2_players) - len(team1_players)
-        team1_scores.extend([2.00] * empty_slots)
         team1_total += 2.00 * empty_slots
         team1_details.extend([f"<span style='color:gray;'>- Empty Slot (Score: 2.00)</span>"] * empty_slots)
         empty_slots_info = f"Team 1 receives {empty_slots} empty slot(s) with SCORE: 2.00 each."
-        st.markdown(f"<div style='text-align: center;'><strong>{empty_slots_info}</strong></div>", unsafe_allow_html=True)
     elif len(team2_players) < len(team1_players):
         empty_slots = len(team1_players) - len(team2_players)
-        team2_scores.extend([2.00] * empty_slots)
         team2_total += 2.00 * empty_slots
         team2_details.extend([f"<span style='color:gray;'>- Empty Slot (Score: 2.00)</span>"] * empty_slots)
         empty_slots_info = f"Team 2 receives {empty_slots} empty slot(s) with SCORE: 2.00 each."
-        st.markdown(f"<div style='text-align: center;'><strong>{empty_slots_info}</strong></div>", unsafe_allow_html=True)
+
+    # Calculate Trade Ratio (both teams must have at least one player)
+    if team1_total == 0 or team2_total == 0:
+        trade_ratio = None
+    else:
+        trade_ratio = min(team1_total / team2_total, team2_total / team1_total)
+
+    return {
+        'team1_details': team1_details,
+        'team1_total': team1_total,
+        'team2_details': team2_details,
+        'team2_total': team2_total,
+        'empty_slots_info': empty_slots_info,
+        'trade_ratio': trade_ratio,
+    }
+
+def evaluate_trade(lookup, data_key, team1_players, team2_players, week):
+    """
+    Evaluates the trade between Team 1 and Team 2 based on selected players.
+    """
+    trade = compute_trade(lookup, data_key, tuple(team1_players), tuple(team2_players), week)
+    team1_details, team1_total = trade['team1_details'], trade['team1_total']
+    team2_details, team2_total = trade['team2_details'], trade['team2_total']
+    trade_ratio = trade['trade_ratio']
+
+    st.markdown(f"<h3 style='text-align: center;'>Current Week: {week}</h3>", unsafe_allow_html=True)
+
+    if trade['empty_slots_info']:
+        st.markdown(f"<div style='text-align: center;'><strong>{trade['empty_slots_info']}</strong></div>", unsafe_allow_html=True)
 
     # Display Trade Evaluation side by side
     col1, col2 = st.columns(2)
 
     with col1:
         st.markdown(f"<h3 style='text-align: center;'>Team 1 Total Score: {team1_total:.2f}</h3>", unsafe_allow_html=True)
-        for detail in team1_details:
-            st.markdown(f"<div style='text-align: center;'>{detail}</div>", unsafe_allow_html=True)
+        st.markdown(
+            "".join(f"<div style='text-align: center;'>{detail}</div>" for detail in team1_details),
+            unsafe_allow_html=True
+        )
 
     with col2:
         st.markdown(f"<h3 style='text-align: center;'>Team 2 Total Score: {team2_total:.2f}</h3>", unsafe_allow_html=True)
-        for detail in team2_details:
-            st.markdown(f"<div style='text-align: center;'>{detail}</div>", unsafe_allow_html=True)
+        st.markdown(
+            "".join(f"<div style='text-align: center;'>{detail}</div>" for detail in team2_details),
+            unsafe_allow_html=True
+        )
 
     # Validate trade (both teams must have at least one player)
-    if team1_total == 0 or team2_total == 0:
+    if trade_ratio is None:
         st.warning("Both teams must have at least one player.")
         return
 
-    # Calculate Trade Ratio
-    trade_ratio = min(team1_total / team2_total, team2_total / team1_total)
-
     # Center the Trade Ratio
     st.markdown(f"<h3 style='text-align: center;'>Trade Ratio: {trade_ratio:.2f}</h3>", unsafe_allow_html=True)
 
@@ -205,43 +262,56 @@ def evaluate_trade(data, team1_players, team2_players):
 
 # ----------------------- Injured Players Display Function -----------------------
 
-def display_injured_players(data):
+def build_injured_players(data):
+    """
+    Builds the table of injured players with their injury details as plain
+    Python lists keyed by column name.
+    """
+    injured_df = data.loc[data['_is_injured'], ['Player_Name', 'Injury', 'Status']]
+    return {column: injured_df[column].tolist() for column in injured_df.columns}
+
+def display_injured_players(injured_players):
     """
     Displays a table of injured players with their injury details.
     """
-    injured_df = data[data['Injury'].str.lower() != 'healthy']
-    if injured_df.empty:
+    if not injured_players['Player_Name']:
         st.info("No injured players currently.")
     else:
-        injured_players_df = injured_df[['Player_Name', 'Injury', 'Status']].reset_index(drop=True)
-        st.table(injured_players_df)
+        st.table(injured_players)
 
 # ----------------------- Player Rankings Display Function -----------------------
 
-def display_player_rankings(data):
+def build_excel_bytes(rankings_df):
     """
-    Calculates and displays the player rankings based on Total Score.
+    Encodes the rankings as an in-memory Excel workbook.
     """
-    # Calculate week number
-    week = calculate_week()
-    
-    # Get current date for display purposes
-    current_date = datetime.now().strftime("%d_%m_%Y")
-    
+    output = BytesIO()
+    # Save to Excel in memory, include the index to have 'Rank' in the Excel file
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        rankings_df.to_excel(writer, index=True)
+    return output.getvalue()
+
+def build_player_rankings(data, week):
+    """
+    Calculates the player rankings based on Total Score for the given week.
+    """
+    # Work on a shallow copy so the added columns do not leak into the caller's data
+    data = data.copy(deep=False)
+
     # Create display column name
     total_score_display_column = f"Total_Score (Week {week})"
     
     # Calculate Total_Score for each player without enforcing minimums
-    data['Total_Score'] = data.apply(
-        lambda row: (((20 - week) * row['Projection']) / 20) + ((week * row['Regular']) / 20),
-        axis=1
+    data['Total_Score'] = (
+        ((20 - week) * data['Projection'].to_numpy() + week * data['Regular'].to_numpy()) / 20
     ).round(2)
     
     # Create display values for Total_Score
-    data[total_score_display_column] = data['Total_Score'].apply(lambda x: f"{x:.2f}")
+    data[total_score_display_column] = data['Total_Score'].map('{:.2f}'.format)
     
     # Sort data by Total_Score descending and reset index
-    sorted_data = data.sort_values(by='Total_Score', ascending=False).reset_index(drop=True)
+    order = np.argsort(-data['Total_Score'].to_numpy(), kind='stable')
+    sorted_data = data.iloc[order].reset_index(drop=True)
     
     # Set 'Rank' as the index starting from 1
     sorted_data.index = sorted_data.index + 1
@@ -249,24 +319,22 @@ def display_player_rankings(data):
     
     # Reorder columns
     sorted_data = sorted_data[['Player_Name', 'Regular', 'Projection', total_score_display_column]]
-    
+    return sorted_data
+
+def display_player_rankings(sorted_data, current_date):
+    """
+    Displays the player rankings with an option to download them as Excel.
+    """
     # Center the table and download button together
     col_center = st.columns([1, 3, 1])
     with col_center[1]:
         # Display the DataFrame with 'Rank' as index
         st.dataframe(sorted_data)
         
-        # Provide option to download the data
-        output = BytesIO()
-        # Save to Excel in memory, include the index to have 'Rank' in the Excel file
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            sorted_data.to_excel(writer, index=True)
-        processed_data = output.getvalue()
-        
-        # Create a download button
+        # Create a download button (the workbook is only encoded when clicked)
         st.download_button(
             label="Download Player Rankings as Excel",
-            data=processed_data,
+            data=lambda: build_excel_bytes(sorted_data),
             file_name=f"Player_Scores_{current_date}.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         )
@@ -291,11 +359,28 @@ def main():
     injury_report_path = os.path.join(data_dir, "nba-injury-report.xlsx")
 
     if os.path.exists(merged_scores_path) and os.path.exists(injury_report_path):
-        merged_df = read_data(merged_scores_path, injury_report_path)
-        if not merged_df.empty:
-            st.session_state['data'] = merged_df
-            st.session_state['last_updated'] = get_last_updated(merged_scores_path, injury_report_path)
-            data = merged_df
+        # File modification times key the cached loaders
+        scores_mtime = os.path.getmtime(merged_scores_path)
+        injury_mtime = os.path.getmtime(injury_report_path)
+        data_key = (scores_mtime, injury_mtime)
+
+        # Only reload and rebuild derived data when the files have changed
+        if st.session_state.get('data_key') != data_key:
+            merged_df = read_data(merged_scores_path, injury_report_path, scores_mtime, injury_mtime)
+            if not merged_df.empty:
+                st.session_state['data'] = merged_df
+                st.session_state['last_updated'] = get_last_updated(
+                    merged_scores_path, injury_report_path, scores_mtime, injury_mtime
+                )
+                # Plain dict lookup keeps trade scoring off the DataFrame
+                st.session_state['score_lookup'] = build_score_lookup(merged_df)
+                st.session_state['player_names'] = merged_df['Player_Name'].cat.categories.tolist()
+                st.session_state['injured_players'] = build_injured_players(merged_df)
+                st.session_state.pop('rankings_key', None)
+                st.session_state['data_key'] = data_key
+
+        if st.session_state.get('data_key') == data_key:
+            data = st.session_state['data']
             st.success("Data loaded successfully.")
         else:
             st.error("Loaded data is empty. Please ensure the data files are correct.")
@@ -318,6 +403,11 @@ def main():
         st.info("No data available. Please ensure the data files are in place.")
         return
 
+    # Compute the current week and date once for this rerun
+    now = datetime.now()
+    week = calculate_week(now.toordinal())
+    current_date = now.strftime("%d_%m_%Y")
+
     # ------------------- Player Selection -------------------
     # Center the heading
     st.markdown("<h3 style='text-align: center;'>Select Players for Trade</h3>", unsafe_allow_html=True)
@@ -332,14 +422,16 @@ def main():
             # Team 1 Selection List
             team1_selected = st.multiselect(
                 "Select Players for Team 1",
-                options=data['Player_Name'].tolist(),
+                options=st.session_state['player_names'],
                 key="team1_selected"
             )
             # Display Selected Players for Team 1
             if team1_selected:
-                st.markdown("<div style='text-align: center;'><strong>Selected Players for Team 1:</strong></div>", unsafe_allow_html=True)
-                for player in team1_selected:
-                    st.markdown(f"<div style='text-align: center;'>- {player}</div>", unsafe_allow_html=True)
+                st.markdown(
+                    "<div style='text-align: center;'><strong>Selected Players for Team 1:</strong></div>"
+                    + "".join(f"<div style='text-align: center;'>- {player}</div>" for player in team1_selected),
+                    unsafe_allow_html=True
+                )
 
         with col2:
             # Team 2 Heading
@@ -347,14 +439,16 @@ def main():
             # Team 2 Selection List
             team2_selected = st.multiselect(
                 "Select Players for Team 2",
-                options=data['Player_Name'].tolist(),
+                options=st.session_state['player_names'],
                 key="team2_selected"
             )
             # Display Selected Players for Team 2
             if team2_selected:
-                st.markdown("<div style='text-align: center;'><strong>Selected Players for Team 2:</strong></div>", unsafe_allow_html=True)
-                for player in team2_selected:
-                    st.markdown(f"<div style='text-align: center;'>- {player}</div>", unsafe_allow_html=True)
+                st.markdown(
+                    "<div style='text-align: center;'><strong>Selected Players for Team 2:</strong></div>"
+                    + "".join(f"<div style='text-align: center;'>- {player}</div>" for player in team2_selected),
+                    unsafe_allow_html=True
+                )
         
         # Center the Evaluate Trade button using columns
         col_center = st.columns([1, 0.4, 1])
@@ -370,7 +464,7 @@ def main():
             if not team1_selected and not team2_selected:
                 st.warning("Please select players for both teams to evaluate a trade.")
             else:
-                evaluate_trade(data, team1_selected, team2_selected)
+                evaluate_trade(st.session_state['score_lookup'], data_key, team1_selected, team2_selected, week)
 
     # ------------------- Player Rankings Section -------------------
     st.markdown("---")
@@ -392,7 +486,12 @@ def main():
 
     # Display the player rankings based on the state
     if st.session_state.get('show_rankings', False):
-        display_player_rankings(data)
+        # Rankings depend on the data and the current week, so rebuild only when either changes
+        rankings_key = (data_key, week)
+        if st.session_state.get('rankings_key') != rankings_key:
+            st.session_state['player_rankings'] = build_player_rankings(data, week)
+            st.session_state['rankings_key'] = rankings_key
+        display_player_rankings(st.session_state['player_rankings'], current_date)
 
     # ------------------- Injured Players Section -------------------
     st.markdown("---")
@@ -417,7 +516,7 @@ def main():
 
     # Display the injured players table based on the state
     if st.session_state.get('show_injured', False):
-        display_injured_players(data)
+        display_injured_players(st.session_state['injured_players'])
 
 if __name__ == "__main__":
     main()
\ No newline at end of file